@@ -2,14 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import json
-import requests
+import asyncio
+import httpx
 import os
 from io import StringIO
-import matplotlib.pyplot as plt
-import seaborn as sns
 from prompts import generate_data_story_prompt
 from data_loader import load_sample_data, get_sample_data_info, load_uploaded_file
 from data_visualizer import create_chart, auto_generate_charts, set_matplotlib_korean_font
+from utils import hash_dataframe
 
 # 환경 변수 로드 시도 (로컬 개발 환경용)
 try:
@@ -34,6 +34,9 @@ else:
 
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 
+# 스트리밍 응답을 화면에 다시 그리는 간격 (청크 수)
+STREAM_RENDER_INTERVAL = 20
+
 # API 키가 없는 경우 경고
 if not API_KEY:
     st.warning("OpenAI API 키가 설정되지 않았습니다. Streamlit Cloud의 secrets 또는 .env 파일을 확인하세요.")
@@ -44,21 +47,13 @@ try:
 except Exception as e:
     st.warning(f"한글 폰트 설정 중 오류가 발생했습니다. 차트의 한글이 정상적으로 표시되지 않을 수 있습니다.")
 
-# GPT API 호출 함수
-def generate_data_story(prompt, model="gpt-3.5-turbo"):
-    if not API_KEY:
-        st.error("API 키가 설정되지 않았습니다.")
-        return None
-        
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}"
-    }
-    
+# GPT API 호출 함수 (비동기 - 여러 요청이 네트워크 대기 시간을 공유)
+async def generate_data_story(client, prompt, model="gpt-3.5-turbo"):
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.7
+        "temperature": 0.7,
+        "stream": True
     }
     
     # response_format 추가 (일부 모델만 지원)
@@ -71,62 +66,122 @@ def generate_data_story(prompt, model="gpt-3.5-turbo"):
         pass
     
     try:
-        response = requests.post(OPENAI_API_URL, headers=headers, json=payload)
-        response.raise_for_status()  # 오류 발생시 예외 발생
+        # 스트리밍 요청 - 전체 응답을 기다리지 않고 토큰이 도착하는 대로 표시
+        async with client.stream("POST", OPENAI_API_URL, json=payload, timeout=60) as response:
+            if response.is_error:
+                # 오류 메시지 표시를 위해 본문을 먼저 읽어둠
+                await response.aread()
+            response.raise_for_status()  # 오류 발생시 예외 발생
+            
+            # 응답 디버깅 (디버그 모드에서만 표시)
+            if st.session_state.get("debug_mode", False):
+                st.write("API 응답:", response.status_code)
+            
+            # SSE(data: ...) 청크를 읽으면서 내용을 누적
+            placeholder = st.empty()
+            content = ""
+            chunk_count = 0
+            async for line in response.aiter_lines():
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                
+                choices = json.loads(data).get("choices", [])
+                if not choices:
+                    continue
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    content += delta
+                    chunk_count += 1
+                    # 매 토큰마다 다시 그리지 않도록 일정 간격으로만 갱신
+                    if chunk_count % STREAM_RENDER_INTERVAL == 0:
+                        placeholder.code(content, language="json")
+        
+        # 스트리밍이 끝나면 중간 출력은 지우고 구조화된 결과로 표시
+        placeholder.empty()
         
-        # 응답 디버깅
-        st.write("API 응답:", response.status_code)
+        if not content:
+            st.error("API 응답 형식 오류: 응답 내용이 비어 있습니다.")
+            return None
         
-        # 응답 형식 확인
-        response_json = response.json()
-        if "choices" in response_json and len(response_json["choices"]) > 0:
-            content = response_json["choices"][0]["message"]["content"]
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                st.error("API 응답이 유효한 JSON 형식이 아닙니다.")
-                st.write("원본 응답:", content)
-                return None
-        else:
-            st.error(f"API 응답 형식 오류: {response_json}")
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            st.error("API 응답이 유효한 JSON 형식이 아닙니다.")
+            st.write("원본 응답:", content)
             return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPStatusError as e:
+        st.error(f"API 요청 오류: {e}")
+        st.error(f"응답 내용: {e.response.text}")
+        return None
+    except httpx.HTTPError as e:
         st.error(f"API 요청 오류: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            st.error(f"응답 내용: {e.response.text}")
         return None
     except (KeyError, json.JSONDecodeError) as e:
         st.error(f"응답 파싱 오류: {e}")
         return None
 
-# 기본 통계 분석 함수
-def analyze_dataframe(df):
+# 세션별 이벤트 루프와 HTTP 클라이언트 (재실행 간에 유지하여 TCP/TLS 연결을 재사용)
+# AsyncClient의 연결은 생성된 이벤트 루프에 묶여 있으므로 루프도 함께 보관
+def _get_http_session():
+    if "_http_session" not in st.session_state:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {API_KEY}"
+        }
+        loop = asyncio.new_event_loop()
+        client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+        st.session_state["_http_session"] = (loop, client)
+    
+    return st.session_state["_http_session"]
+
+async def _gather_data_stories(client, prompts, model):
+    # 하나의 클라이언트(연결 풀)로 모든 요청을 동시에 전송
+    return await asyncio.gather(*[generate_data_story(client, prompt, model) for prompt in prompts])
+
+# 여러 프롬프트를 동시에 요청하고 입력 순서대로 결과를 반환
+def generate_many(prompts, model="gpt-3.5-turbo"):
+    if not API_KEY:
+        st.error("API 키가 설정되지 않았습니다.")
+        return [None] * len(prompts)
+    
+    loop, client = _get_http_session()
+    return loop.run_until_complete(_gather_data_stories(client, prompts, model))
+
+# 기본 통계 분석 함수 (같은 데이터프레임이면 캐시된 결과 재사용)
+# _na_counts: 미리 계산된 열별 결측치 개수 (df에서 파생된 값이므로 캐시 키에서 제외)
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: hash_dataframe})
+def analyze_dataframe(df, _na_counts=None):
     analysis = {}
     
     # 기본 정보
     analysis["basic_info"] = {
         "rows": df.shape[0],
         "columns": df.shape[1],
-        "column_types": {col: str(dtype) for col, dtype in df.dtypes.items()}
+        "column_types": df.dtypes.astype(str).to_dict()
     }
     
-    # 수치형 열에 대한 기본 통계
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    # 수치형 열에 대한 기본 통계 (열마다 반복하지 않고 한 번에 집계)
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
     if numeric_cols:
-        analysis["numeric_stats"] = {}
-        for col in numeric_cols:
-            analysis["numeric_stats"][col] = {
-                "mean": float(df[col].mean()),
-                "median": float(df[col].median()),
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-                "std": float(df[col].std())
-            }
+        stats = df[numeric_cols].agg(['mean', 'median', 'min', 'max', 'std']).astype(float)
+        analysis["numeric_stats"] = {col: stats[col].to_dict() for col in numeric_cols}
         
-        # 상관관계 매트릭스
+        # 상관관계 - 대칭 행렬의 위쪽 삼각형만 {a, b, r} 목록으로 저장
+        # (프롬프트 토큰 절약을 위해 소수점 3자리로 반올림하고 |r| < 0.1은 제외)
         if len(numeric_cols) > 1:
-            corr_matrix = df[numeric_cols].corr().to_dict()
-            analysis["correlation"] = corr_matrix
+            corr_matrix = df[numeric_cols].corr().to_numpy()
+            rows, cols = np.triu_indices(len(numeric_cols), k=1)
+            analysis["correlation"] = [
+                {"a": numeric_cols[i], "b": numeric_cols[j], "r": round(float(corr_matrix[i, j]), 3)}
+                for i, j in zip(rows, cols)
+                if abs(corr_matrix[i, j]) >= 0.1
+            ]
     
     # 범주형 열에 대한 기본 통계
     categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
@@ -137,11 +192,29 @@ def analyze_dataframe(df):
             counts = df[col].value_counts().head(5).to_dict()
             analysis["categorical_stats"][col] = counts
     
-    # 결측치 정보
-    analysis["missing_values"] = df.isnull().sum().to_dict()
+    # 결측치 정보 (미리보기에서 계산한 값이 있으면 재사용)
+    na_counts = _na_counts if _na_counts is not None else df.isna().sum()
+    analysis["missing_values"] = na_counts.to_dict()
     
     return analysis
 
+# 데이터 미리보기 및 기본 정보 표시 (열별 결측치 개수를 반환하여 분석 단계에서 재사용)
+def _show_data_preview(df):
+    na_counts = df.isna().sum()
+    
+    st.subheader("데이터 미리보기")
+    st.dataframe(df.head())
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("행 수", df.shape[0])
+    with col2:
+        st.metric("열 수", df.shape[1])
+    with col3:
+        st.metric("결측치", int(na_counts.sum()))
+    
+    return na_counts
+
 # 애플리케이션 UI
 def main():
     st.title("📊 데이터 스토리텔러")
@@ -165,49 +238,37 @@ def main():
             value="보통"
         )
         
-        # matplotlib 스타일 목록 수정 - 최신 버전 호환성을 위해
-        available_styles = ['default', 'classic', 'ggplot', 'bmh', 'dark_background']
+        # 차트 스타일 - 선택한 스타일을 Plotly 템플릿으로 적용
+        chart_templates = {
+            'default': 'plotly',
+            'classic': 'simple_white',
+            'ggplot': 'ggplot2',
+            'bmh': 'seaborn',
+            'dark_background': 'plotly_dark'
+        }
         
         chart_style = st.selectbox(
             "차트 스타일",
-            available_styles
+            list(chart_templates.keys())
         )
+        chart_template = chart_templates[chart_style]
         
-        # 스타일 적용 시도, 실패하면 기본 스타일 사용
-        try:
-            plt.style.use(chart_style)
-        except Exception as e:
-            st.warning(f"스타일 '{chart_style}'을 적용할 수 없습니다. 기본 스타일을 사용합니다.")
-            plt.style.use('default')
+        # 디버그 모드 - 분석 결과, 프롬프트 등 개발용 정보 표시
+        debug = st.checkbox("디버그 모드", value=False, key="debug_mode")
     
     # 파일 업로드
     uploaded_file = st.file_uploader("CSV 파일을 업로드하세요", type=['csv'])
     
     df = None
+    na_counts = None
     
     if uploaded_file is not None:
         try:
-            # 업로드된 파일 처리
-            try:
-                # 먼저 기본 방식으로 시도
-                df = pd.read_csv(uploaded_file)
-            except UnicodeDecodeError:
-                # 인코딩 오류 발생 시 사용자 정의 함수 사용
-                uploaded_file.seek(0)  # 파일 포인터 초기화
-                df = load_uploaded_file(uploaded_file)
-            
-            # 기본 데이터 미리보기
-            st.subheader("데이터 미리보기")
-            st.dataframe(df.head())
+            # 업로드된 파일 처리 (인코딩 감지 후 멀티스레드 파서로 읽기)
+            df = load_uploaded_file(uploaded_file)
             
-            # 기본 정보 표시
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("행 수", df.shape[0])
-            with col2:
-                st.metric("열 수", df.shape[1])
-            with col3:
-                st.metric("결측치", df.isnull().sum().sum())
+            # 기본 데이터 미리보기 및 정보 표시
+            na_counts = _show_data_preview(df)
             
         except Exception as e:
             st.error(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
@@ -231,18 +292,8 @@ def main():
                 try:
                     df = load_sample_data(sample_name)
                     
-                    # 기본 데이터 미리보기
-                    st.subheader("데이터 미리보기")
-                    st.dataframe(df.head())
-                    
-                    # 기본 정보 표시
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("행 수", df.shape[0])
-                    with col2:
-                        st.metric("열 수", df.shape[1])
-                    with col3:
-                        st.metric("결측치", df.isnull().sum().sum())
+                    # 기본 데이터 미리보기 및 정보 표시
+                    na_counts = _show_data_preview(df)
                     
                     st.success(f"{sample_option} 데이터가 로드되었습니다. '데이터 스토리 생성' 버튼을 눌러 계속하세요.")
                 except Exception as e:
@@ -252,11 +303,12 @@ def main():
     if df is not None and st.button("데이터 스토리 생성"):
         with st.spinner("데이터를 분석하고 스토리를 생성 중입니다..."):
             # 데이터 분석
-            analysis_result = analyze_dataframe(df)
+            analysis_result = analyze_dataframe(df, na_counts)
             
-            # 분석 결과 디버깅 (개발 중에만 사용)
-            with st.expander("데이터 분석 결과 (디버깅용)"):
-                st.json(analysis_result)
+            # 분석 결과 디버깅 (디버그 모드에서만 표시)
+            if debug:
+                with st.expander("데이터 분석 결과 (디버깅용)"):
+                    st.json(analysis_result)
             
             # 사용자 설정에 맞는 프롬프트 생성
             prompt = generate_data_story_prompt(
@@ -264,12 +316,13 @@ def main():
                 audience=audience,
                 focus=story_focus,
                 length=story_length,
-                sample_data=df.head(10).to_dict()
+                sample_data=df.head(10).to_csv(index=False)
             )
             
-            # 프롬프트 디버깅 (개발 중에만 사용)
-            with st.expander("생성된 프롬프트 (디버깅용)"):
-                st.text(prompt)
+            # 프롬프트 디버깅 (디버그 모드에서만 표시)
+            if debug:
+                with st.expander("생성된 프롬프트 (디버깅용)"):
+                    st.text(prompt)
             
             # GPT API 호출 전 더미 데이터 준비 (API 오류 시 사용)
             dummy_data = {
@@ -280,7 +333,7 @@ def main():
                         "chart_recommendation": {
                             "type": "bar",
                             "x_column": df.columns[0] if len(df.columns) > 0 else "",
-                            "y_column": df.select_dtypes(include=['int64', 'float64']).columns[0] if len(df.select_dtypes(include=['int64', 'float64']).columns) > 0 else "",
+                            "y_column": df.select_dtypes(include='number').columns[0] if len(df.select_dtypes(include='number').columns) > 0 else "",
                             "title": "샘플 차트",
                             "description": "샘플 차트 설명"
                         }
@@ -295,8 +348,9 @@ def main():
                 ]
             }
             
-            # GPT API 호출
-            story_result = generate_data_story(prompt)
+            # GPT API 호출 - 요청할 프롬프트를 모아 한 번에 동시 전송
+            prompts = [prompt]
+            story_result = generate_many(prompts)[0]
             
             # API 호출 실패 시 더미 데이터 사용
             if story_result is None:
@@ -327,17 +381,12 @@ def main():
                             try:
                                 if all(k in chart_info for k in ["type", "x_column", "y_column"]):
                                     if chart_info["x_column"] in df.columns and chart_info["y_column"] in df.columns:
-                                        # 한글 폰트 재확인
-                                        try:
-                                            set_matplotlib_korean_font()
-                                        except:
-                                            pass
-
                                         fig = create_chart(df, chart_info)
                                         if fig:
-                                            st.pyplot(fig)
+                                            fig.update_layout(template=chart_template)
+                                            st.plotly_chart(fig, use_container_width=True, theme=None)
                                         else:
-                                            st.warning("차트를 생성할 수 없습니다.")
+                                            st.warning(f"차트를 생성할 수 없습니다: 지원하지 않는 차트 유형({chart_info.get('type', '')})이거나 데이터가 부족합니다.")
                                     else:
                                         st.warning(f"차트 생성에 필요한 열이 데이터에 없습니다.")
                             except Exception as e:
@@ -356,9 +405,10 @@ def main():
                     if isinstance(action, dict):
                         st.markdown(f"- **{action.get('title', '')}**: {action.get('description', '')}")
             
-            # 원본 JSON 데이터 보기 (디버깅용)
-            with st.expander("원본 JSON 데이터"):
-                st.json(story_result)
+            # 원본 JSON 데이터 보기 (디버그 모드에서만 표시)
+            if debug:
+                with st.expander("원본 JSON 데이터"):
+                    st.json(story_result)
     
     # 필수 패키지 정보
     with st.expander("필요한 패키지 정보"):
@@ -368,9 +418,9 @@ def main():
         - pandas
         - numpy
         - matplotlib
-        - seaborn
-        - requests
-        - chardet (한글 인코딩 감지용)
+        - plotly
+        - httpx
+        - charset-normalizer (한글 인코딩 감지용)
         
         로컬 개발 환경에서 실행할 경우:
         - python-dotenv (환경 변수 로드용)
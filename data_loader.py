@@ -5,22 +5,267 @@
 import pandas as pd
 import numpy as np
 import os
-import chardet
+import io
+import re
+from charset_normalizer import from_bytes
 import streamlit as st
 
+# PyArrow가 설치되어 있으면 멀티스레드 CSV 파서 사용
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+    # pandas 기본 결측치 표기와 맞춤 (PyArrow 기본값에는 '<NA>', 'None'이 없음)
+    _PYARROW_NULL_VALUES = list(pa_csv.ConvertOptions().null_values) + ['<NA>', 'None']
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Numba가 설치되어 있으면 이상치 처리를 JIT 컴파일된 커널로 수행
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _iqr_clip(a):
+        """
+        2차원 배열의 각 열에 IQR 기반 이상치 경계값 클리핑을 제자리(in-place)에서 적용합니다.
+        
+        Args:
+            a (numpy.ndarray): float64 2차원 배열 (행 x 열)
+        """
+        for j in prange(a.shape[1]):
+            col = a[:, j]
+            q1 = np.nanquantile(col, 0.25)
+            q3 = np.nanquantile(col, 0.75)
+            iqr = q3 - q1
+            lower_bound = q1 - 1.5 * iqr
+            upper_bound = q3 + 1.5 * iqr
+            
+            for i in range(a.shape[0]):
+                if a[i, j] < lower_bound:
+                    a[i, j] = lower_bound
+                elif a[i, j] > upper_bound:
+                    a[i, j] = upper_bound
+
+# 인코딩 감지에 사용할 파일 앞부분 크기 (바이트)
+ENCODING_SAMPLE_SIZE = 65536
+
+def detect_encoding_from_bytes(sample):
+    """
+    바이트 샘플의 인코딩을 감지합니다.
+    
+    Args:
+        sample (bytes): 파일 앞부분 바이트
+    
+    Returns:
+        str: 감지된 인코딩 (감지 실패시 None)
+    """
+    result = from_bytes(sample).best()
+    return result.encoding if result is not None else None
+
 def detect_encoding(file_path):
     """
-    파일의 인코딩을 감지합니다.
+    파일 앞부분을 읽어 인코딩을 감지합니다.
     
     Args:
         file_path (str): 파일 경로
     
     Returns:
-        str: 감지된 인코딩
+        str: 감지된 인코딩 (감지 실패시 None)
     """
     with open(file_path, 'rb') as f:
-        result = chardet.detect(f.read())
-    return result['encoding']
+        sample = f.read(ENCODING_SAMPLE_SIZE)
+    return detect_encoding_from_bytes(sample)
+
+# 날짜 열로 취급할 열 이름 패턴
+_DATE_COLUMN_PATTERN = re.compile(r'date', re.IGNORECASE)
+
+def _find_date_columns(columns):
+    """
+    열 이름에 'date'가 포함된 열을 찾습니다.
+    
+    Args:
+        columns (iterable): 열 이름 목록
+    
+    Returns:
+        list: 날짜 열 이름 리스트
+    """
+    return [col for col in columns if _DATE_COLUMN_PATTERN.search(str(col))]
+
+def _as_csv_source(source):
+    """
+    pd.read_csv에 전달할 입력을 반환합니다. 바이트는 매번 새 버퍼로 감쌉니다.
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+# pandas는 int64 범위를 넘는 정수를 uint64로 읽지만 PyArrow는 float64로 읽음
+_INT64_LIMIT = 2 ** 63
+
+def _arrow_matches_pandas(table):
+    """
+    PyArrow로 읽은 테이블이 pandas 기본 엔진과 같은 열 이름과 형식으로 변환되는지 확인합니다.
+    
+    Args:
+        table (pyarrow.Table): PyArrow로 읽은 테이블
+    
+    Returns:
+        bool: pandas 결과와 같으면 True
+    """
+    # 중복/빈 열 이름은 pandas가 a.1, Unnamed: 0 처럼 바꾸지만 PyArrow는 그대로 둠
+    names = table.column_names
+    if '' in names or len(set(names)) != len(names):
+        return False
+    
+    # int64 범위를 넘는 값이 있는 실수 열은 정밀도가 손실되었을 수 있음
+    for column in table.columns:
+        if pa.types.is_floating(column.type):
+            largest = pc.max(pc.abs(column)).as_py()
+            if largest is not None and largest >= _INT64_LIMIT:
+                return False
+    return True
+
+def _read_arrow_table(source, encoding, column_types=None):
+    """
+    PyArrow의 멀티스레드 파서로 CSV를 읽습니다.
+    
+    Args:
+        source (str 또는 bytes): CSV 파일 경로 또는 파일 내용
+        encoding (str): 파일 인코딩
+        column_types (dict, optional): 형식을 추론하지 않고 지정할 열 이름과 PyArrow 형식
+    
+    Returns:
+        pyarrow.Table: 로드된 테이블
+    """
+    return pa_csv.read_csv(
+        _as_csv_source(source),
+        read_options=pa_csv.ReadOptions(encoding=encoding),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            # 문자열 열에서도 빈 칸과 NA/N/A/null 등을 pandas처럼 결측치로 처리
+            null_values=_PYARROW_NULL_VALUES,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True
+        )
+    )
+
+def _parse_date_columns(df, date_columns):
+    """
+    날짜 열을 datetime 형식으로 변환합니다. 변환할 수 없는 열은 그대로 둡니다. (pandas parse_dates와 동일)
+    
+    Args:
+        df (pandas.DataFrame): 변환할 데이터프레임 (제자리에서 변경)
+        date_columns (list): 날짜로 변환할 열 이름 리스트
+    """
+    for col in date_columns:
+        try:
+            df[col] = pd.to_datetime(df[col])
+        except (ValueError, TypeError):
+            pass
+
+def _read_csv_fast(source, encoding, date_columns=None):
+    """
+    지정한 인코딩으로 CSV 전체를 읽습니다.
+    PyArrow의 멀티스레드 파서를 우선 사용하고, 사용할 수 없으면 pandas 기본 엔진으로 읽습니다.
+    
+    Args:
+        source (str 또는 bytes): CSV 파일 경로 또는 파일 내용
+        encoding (str): 파일 인코딩
+        date_columns (list, optional): 읽으면서 날짜로 변환할 열 이름 리스트
+    
+    Returns:
+        pandas.DataFrame: 로드된 데이터프레임
+    """
+    date_columns = list(date_columns or [])
+    
+    if PYARROW_AVAILABLE:
+        try:
+            # 날짜 열은 형식과 상관없이 문자열로 읽은 뒤 pandas로 변환
+            column_types = {col: pa.string() for col in date_columns}
+            table = _read_arrow_table(source, encoding, column_types)
+            
+            # 날짜 열이 아닌데 값만 보고 날짜로 추론된 열은 pandas처럼 문자열로 다시 읽기
+            inferred = [
+                field.name for field in table.schema
+                if pa.types.is_temporal(field.type) and field.name not in column_types
+            ]
+            if inferred:
+                column_types.update({col: pa.string() for col in inferred})
+                table = _read_arrow_table(source, encoding, column_types)
+            
+            # pandas 엔진과 열 이름/형식이 달라지는 파일은 pandas 엔진으로 읽기
+            if _arrow_matches_pandas(table):
+                df = table.to_pandas()
+                _parse_date_columns(df, date_columns)
+                return df
+        except pa.ArrowInvalid:
+            # PyArrow가 처리하지 못하는 형식은 pandas 엔진으로 재시도
+            pass
+    
+    return pd.read_csv(_as_csv_source(source), encoding=encoding, parse_dates=date_columns or False)
+
+def _shrink(df):
+    """
+    정수형 열을 값 손실 없이 더 작은 dtype으로 변환하여 메모리 사용량을 줄입니다.
+    실수형 열은 합계/평균 등의 집계가 float32로 계산되어 정밀도가 떨어지므로 float64로 유지합니다.
+    
+    Args:
+        df (pandas.DataFrame): 변환할 데이터프레임
+    
+    Returns:
+        pandas.DataFrame: 변환된 데이터프레임
+    """
+    # 열 이름이 중복될 수 있으므로 이름이 아닌 위치로 열을 처리
+    columns = []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'iu':
+            col = pd.to_numeric(col, downcast='integer')
+        columns.append(col)
+    
+    if not columns:
+        return df
+    
+    shrunk = pd.concat(columns, axis=1)
+    shrunk.columns = df.columns
+    return shrunk
+
+def _read_csv_with_encodings(source, detected=None):
+    """
+    감지된 인코딩과 일반적인 인코딩을 차례로 시도하여 CSV를 읽습니다.
+    
+    Args:
+        source (str 또는 bytes): CSV 파일 경로 또는 파일 내용
+        detected (str, optional): 가장 먼저 시도할 감지된 인코딩
+    
+    Returns:
+        pandas.DataFrame: 로드된 데이터프레임
+    """
+    encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
+    if detected:
+        encodings.insert(0, detected)
+    
+    df = None
+    for enc in encodings:
+        try:
+            # 앞부분 몇 행만 읽어 인코딩이 맞는지 먼저 확인
+            probe = pd.read_csv(_as_csv_source(source), encoding=enc, nrows=5)
+            df = _read_csv_fast(source, enc, _find_date_columns(probe.columns))
+            break
+        except:
+            continue
+    
+    # 모든 인코딩 시도 실패시 예외 발생
+    if df is None:
+        raise ValueError("지원되는 인코딩으로 파일을 읽을 수 없습니다.")
+    
+    # 인코딩 재시도 대상이 아니므로 변환 중 오류는 그대로 전달
+    return _shrink(df)
 
 def load_csv_with_encoding(file_path):
     """
@@ -32,24 +277,15 @@ def load_csv_with_encoding(file_path):
     Returns:
         pandas.DataFrame: 로드된 데이터프레임
     """
-    # 인코딩 감지 시도
+    # 감지된 인코딩을 먼저 시도하고, 실패하면 일반적인 인코딩 시도
     try:
-        encoding = detect_encoding(file_path)
-        df = pd.read_csv(file_path, encoding=encoding)
-        return df
+        detected = detect_encoding(file_path)
     except:
-        # 인코딩 감지 실패시 일반적인 인코딩 시도
-        encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
-        for enc in encodings:
-            try:
-                df = pd.read_csv(file_path, encoding=enc)
-                return df
-            except:
-                continue
-        
-        # 모든 인코딩 시도 실패시 예외 발생
-        raise ValueError("지원되는 인코딩으로 파일을 읽을 수 없습니다.")
+        detected = None
+    
+    return _read_csv_with_encodings(file_path, detected)
 
+@st.cache_data(show_spinner=False)
 def load_sample_data(sample_name):
     """
     샘플 데이터를 로드합니다.
@@ -63,31 +299,37 @@ def load_sample_data(sample_name):
     sample_data_path = os.path.join("sample_data", f"{sample_name}.csv")
     
     try:
-        df = load_csv_with_encoding(sample_data_path)
-        return df
+        # 저장소에 포함된 샘플 데이터는 인코딩이 정해져 있으므로 감지/재시도 없이 바로 읽기
+        info = get_sample_data_info()[sample_name]
+        df = _read_csv_fast(sample_data_path, info["encoding"], _find_date_columns(info["columns"]))
+        return _shrink(df)
     except Exception as e:
         raise Exception(f"샘플 데이터 로드 중 오류 발생: {e}")
 
+@st.cache_resource
 def get_sample_data_info():
     """
     사용 가능한 샘플 데이터와 설명을 반환합니다.
     
     Returns:
-        dict: 샘플 데이터 이름과 설명
+        dict: 샘플 데이터 이름과 설명 (파일 인코딩 포함)
     """
     return {
         "sales_data": {
             "title": "판매 데이터",
+            "encoding": "utf-8",
             "description": "날짜, 지역, 제품 카테고리, 판매액, 판매량 등이 포함된 판매 데이터입니다.",
             "columns": ["date", "region", "product_category", "sales_amount", "units_sold", "customer_type", "promotion_active"]
         },
         "marketing_campaign": {
             "title": "마케팅 캠페인 데이터",
+            "encoding": "utf-8",
             "description": "여러 마케팅 채널의 비용, 노출, 클릭, 전환 등 캠페인 성과 데이터입니다.",
             "columns": ["campaign_id", "date", "channel", "cost", "impressions", "clicks", "conversions", "conversion_value", "target_audience"]
         },
         "customer_satisfaction": {
             "title": "고객 만족도 조사",
+            "encoding": "utf-8",
             "description": "제품 품질, 고객 서비스, 가격 만족도 등에 대한 고객 설문 결과입니다.",
             "columns": ["survey_id", "date", "customer_id", "age_group", "gender", "purchase_frequency", "product_quality_rating", "customer_service_rating", "price_satisfaction", "recommendation_likelihood", "overall_satisfaction", "feedback_text"]
         }
@@ -110,8 +352,11 @@ def clean_data(df, params=None):
     # 복사본 생성
     cleaned_df = df.copy()
     
-    # 날짜 열 변환
-    date_columns = [col for col in cleaned_df.columns if 'date' in col.lower()]
+    # 날짜 열 변환 (로드 시 이미 변환된 열은 건너뜀)
+    date_columns = [
+        col for col in _find_date_columns(cleaned_df.columns)
+        if not pd.api.types.is_datetime64_any_dtype(cleaned_df[col])
+    ]
     for col in date_columns:
         try:
             cleaned_df[col] = pd.to_datetime(cleaned_df[col])
@@ -120,34 +365,45 @@ def clean_data(df, params=None):
     
     # 결측치 처리 (선택적)
     if params.get('handle_missing', False):
-        numeric_cols = cleaned_df.select_dtypes(include=['int64', 'float64']).columns
+        numeric_cols = cleaned_df.select_dtypes(include='number').columns
         categorical_cols = cleaned_df.select_dtypes(include=['object', 'category']).columns
         
-        # 수치형 열 - 평균으로 대체
-        for col in numeric_cols:
-            cleaned_df[col].fillna(cleaned_df[col].mean(), inplace=True)
+        # 수치형 열 - 평균으로 대체 (모든 열을 한 번에 처리)
+        if len(numeric_cols) > 0:
+            means = cleaned_df[numeric_cols].mean()
+            cleaned_df[numeric_cols] = cleaned_df[numeric_cols].fillna(means)
         
-        # 범주형 열 - 최빈값으로 대체
-        for col in categorical_cols:
-            if not cleaned_df[col].isna().any():
-                continue
-            try:
-                cleaned_df[col].fillna(cleaned_df[col].mode()[0], inplace=True)
-            except:
-                pass
+        # 범주형 열 - 최빈값으로 대체 (결측치가 있는 열만)
+        missing_cols = categorical_cols[cleaned_df[categorical_cols].isna().any().to_numpy()]
+        if len(missing_cols) > 0:
+            modes = cleaned_df[missing_cols].mode()
+            if not modes.empty:
+                cleaned_df[missing_cols] = cleaned_df[missing_cols].fillna(modes.iloc[0])
     
     # 이상치 처리 (선택적)
     if params.get('handle_outliers', False):
-        numeric_cols = cleaned_df.select_dtypes(include=['int64', 'float64']).columns
-        for col in numeric_cols:
-            Q1 = cleaned_df[col].quantile(0.25)
-            Q3 = cleaned_df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
+        numeric_cols = cleaned_df.select_dtypes(include='number').columns
+        if NUMBA_AVAILABLE and len(numeric_cols) > 0:
+            # 수치형 열 전체를 하나의 배열로 꺼내 한 번에 처리
+            original = cleaned_df[numeric_cols].to_numpy(dtype=np.float64)
+            arr = original.copy()
+            _iqr_clip(arr)
             
-            # 이상치를 경계값으로 대체
-            cleaned_df[col] = cleaned_df[col].clip(lower=lower_bound, upper=upper_bound)
+            # 경계값으로 바뀐 값만 다시 쓰기 (바뀐 값이 없는 열은 원래 dtype 유지, clip과 동일한 형식 변환)
+            changed = (arr != original) & ~np.isnan(original)
+            for j in np.flatnonzero(changed.any(axis=0)):
+                col = numeric_cols[j]
+                cleaned_df[col] = cleaned_df[col].mask(changed[:, j], arr[:, j])
+        else:
+            for col in numeric_cols:
+                Q1 = cleaned_df[col].quantile(0.25)
+                Q3 = cleaned_df[col].quantile(0.75)
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                
+                # 이상치를 경계값으로 대체
+                cleaned_df[col] = cleaned_df[col].clip(lower=lower_bound, upper=upper_bound)
     
     return cleaned_df
 
@@ -162,20 +418,9 @@ def load_uploaded_file(uploaded_file):
         pandas.DataFrame: 로드된 데이터프레임
     """
     try:
-        # 파일을 임시 디렉토리에 저장
-        temp_path = f"temp_{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
-        # 인코딩 감지 및 파일 읽기
-        df = load_csv_with_encoding(temp_path)
-        
-        # 임시 파일 삭제
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
-        return df
+        # 디스크에 임시 파일을 쓰지 않고 메모리의 내용을 그대로 사용
+        raw = uploaded_file.getvalue()
+        detected = detect_encoding_from_bytes(raw[:ENCODING_SAMPLE_SIZE])
+        return _read_csv_with_encodings(raw, detected)
     except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         raise Exception(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
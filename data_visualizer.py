@@ -5,32 +5,68 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import matplotlib.font_manager as fm
 import platform
 import os
+import functools
+from utils import hash_dataframe, hash_dict, numeric_corr
 
-# 한글 폰트 설정
-def set_matplotlib_korean_font():
+def _installed_font_names():
     """
-    Matplotlib에 한글 폰트 설정을 적용합니다.
+    설치된 폰트 이름을 소문자 이름으로 조회할 수 있도록 수집합니다.
+    
+    Returns:
+        dict: {소문자 폰트 이름: 실제 폰트 이름} (이름순)
+    """
+    return {name.lower(): name for name in sorted({f.name for f in fm.fontManager.ttflist})}
+
+def _find_font(candidates, available):
+    """
+    후보 폰트 중 설치된 첫 번째 폰트를 찾습니다. (이름이 정확히 같은 폰트를 먼저, 없으면 이름에 후보가 포함된 폰트)
+    
+    Args:
+        candidates (list): 우선순위 순서의 후보 폰트 이름
+        available (dict): {소문자 폰트 이름: 실제 폰트 이름}
+    
+    Returns:
+        str: 찾은 폰트 이름 (없으면 None)
+    """
+    for candidate in candidates:
+        key = candidate.lower()
+        if key in available:
+            return available[key]
+        
+        match = next((name for lower, name in available.items() if key in lower), None)
+        if match:
+            return match
+    
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _configure_korean_font_once():
+    """
+    시스템에 설치된 한글 폰트를 찾습니다.
+    폰트 목록 검색은 프로세스당 한 번만 수행되고, 이후에는 캐시된 결과를 반환합니다.
+    
+    Returns:
+        str: 사용할 폰트 이름 (찾지 못한 경우 'sans-serif')
     """
     system_name = platform.system()
     
     try:
+        # 설치된 폰트 이름을 한 번만 수집하여 소문자 이름으로 조회
+        available = _installed_font_names()
+        
         # Streamlit Cloud (Linux)를 위한 설정
         if system_name == 'Linux':
             # Nanum 폰트를 먼저 시도 (packages.txt에 fonts-nanum 추가 필요)
-            for font_name in ['NanumGothic', 'NanumGothicCoding', 'NanumBarunGothic']:
-                for font in fm.fontManager.ttflist:
-                    if font_name.lower() in font.name.lower():
-                        plt.rcParams['font.family'] = font.name
-                        plt.rcParams['axes.unicode_minus'] = False
-                        print(f"Found Korean font: {font.name}")
-                        return
+            font_name = _find_font(['NanumGothic', 'NanumGothicCoding', 'NanumBarunGothic'], available)
+            if font_name:
+                print(f"Found Korean font: {font_name}")
+                return font_name
 
             # 직접 폰트 경로 지정 시도
             font_dirs = ['/usr/share/fonts/truetype/nanum']
@@ -41,47 +77,60 @@ def set_matplotlib_korean_font():
                         fm.fontManager.addfont(font_file)
                     
                     # 다시 폰트 찾기 시도
-                    for font in fm.fontManager.ttflist:
-                        if 'nanum' in font.name.lower():
-                            plt.rcParams['font.family'] = font.name
-                            plt.rcParams['axes.unicode_minus'] = False
-                            print(f"Added Korean font: {font.name}")
-                            return
+                    font_name = _find_font(['nanum'], _installed_font_names())
+                    if font_name:
+                        print(f"Added Korean font: {font_name}")
+                        return font_name
             
             # 마지막 수단으로 기본 폰트 지정
-            plt.rcParams['font.family'] = 'sans-serif'
             print("No Korean font found on Linux, using default sans-serif font")
             
         elif system_name == 'Windows':
             # Windows 시스템 폰트 목록
             font_list = ['Malgun Gothic', 'NanumGothic', 'NanumBarunGothic', 'Gulim']
-            for font in font_list:
-                if any([font.lower() in f.name.lower() for f in fm.fontManager.ttflist]):
-                    plt.rcParams['font.family'] = font
-                    plt.rcParams['axes.unicode_minus'] = False
-                    return
+            font_name = _find_font(font_list, available)
+            if font_name:
+                return font_name
                     
         elif system_name == 'Darwin':  # macOS
             # macOS 시스템 폰트 목록
             font_list = ['AppleGothic', 'NanumGothic', 'NanumBarunGothic']
-            for font in font_list:
-                if any([font.lower() in f.name.lower() for f in fm.fontManager.ttflist]):
-                    plt.rcParams['font.family'] = font
-                    plt.rcParams['axes.unicode_minus'] = False
-                    return
-        
-        # 기본 설정
-        plt.rcParams['font.family'] = 'sans-serif'  
-        plt.rcParams['axes.unicode_minus'] = False
+            font_name = _find_font(font_list, available)
+            if font_name:
+                return font_name
         
     except Exception as e:
         print(f"Font setting error: {e}")
-        plt.rcParams['font.family'] = 'sans-serif'
-        plt.rcParams['axes.unicode_minus'] = False
+    
+    # 기본 설정
+    return 'sans-serif'
+
+# 한글 폰트 설정
+def set_matplotlib_korean_font():
+    """
+    Matplotlib에 한글 폰트 설정을 적용합니다.
+    폰트 검색은 최초 호출 시 한 번만 수행하고, 이후에는 찾은 폰트를 다시 적용만 합니다.
+    """
+    font_family = _configure_korean_font_once()
+    
+    # plt.style.use()가 rcParams를 초기화할 수 있으므로 설정값은 매번 적용
+    plt.rcParams['font.family'] = font_family
+    plt.rcParams['axes.unicode_minus'] = False
 
 # 시각화 함수 호출 전에 한글 폰트 설정
 set_matplotlib_korean_font()
 
+# 차트 캐시 설정 - 같은 데이터와 차트 정보로 재실행되면 저장된 차트를 재사용
+# (캐시 적중 시에는 함수가 실행되지 않으므로 경고/오류 표시는 호출하는 쪽에서 처리)
+_CHART_CACHE_HASH_FUNCS = {pd.DataFrame: hash_dataframe, dict: hash_dict}
+
+# 산점도에 표시할 최대 점 개수 (초과하면 표본 추출, 추세선은 전체 데이터로 계산)
+SCATTER_MAX_POINTS = 5000
+
+# 파이 차트에 표시할 최대 조각 수 (나머지는 '기타'로 합산)
+PIE_MAX_SLICES = 8
+
+@st.cache_data(hash_funcs=_CHART_CACHE_HASH_FUNCS, max_entries=32, show_spinner=False)
 def create_chart(df, chart_info):
     """
     차트 정보에 기반하여 적절한 시각화를 생성합니다.
@@ -91,7 +140,10 @@ def create_chart(df, chart_info):
         chart_info (dict): 차트 정보 및 매개변수
     
     Returns:
-        matplotlib.figure.Figure 또는 plotly.graph_objects.Figure: 생성된 차트
+        plotly.graph_objects.Figure: 생성된 차트 (열 정보가 부족하거나 지원하지 않는 유형이면 None)
+    
+    Raises:
+        Exception: 차트 생성 중 오류가 발생한 경우
     """
     chart_type = chart_info.get("type", "").lower()
     x_column = chart_info.get("x_column")
@@ -99,73 +151,59 @@ def create_chart(df, chart_info):
     title = chart_info.get("title", "")
     
     if not x_column or not y_column:
-        st.warning("차트 생성에 필요한 열 정보가 부족합니다.")
         return None
     
     # x_column과 y_column이 실제 데이터프레임에 존재하는지 확인
     if x_column not in df.columns or y_column not in df.columns:
-        st.warning(f"지정된 열({x_column} 또는 {y_column})이 데이터프레임에 존재하지 않습니다.")
         return None
     
     # 차트 유형에 따라 적절한 시각화 생성
+    if chart_type == "bar":
+        return create_bar_chart(df, x_column, y_column, title)
+    elif chart_type == "line":
+        return create_line_chart(df, x_column, y_column, title)
+    elif chart_type == "scatter":
+        return create_scatter_chart(df, x_column, y_column, title)
+    elif chart_type == "pie":
+        return create_pie_chart(df, x_column, y_column, title)
+    elif chart_type == "heatmap":
+        return create_heatmap(df, chart_info)
+    
+    # 지원하지 않는 차트 유형
+    return None
+
+def _create_chart_or_none(df, chart_info):
+    """
+    차트를 생성하고, 생성 중 오류가 발생하면 None을 반환합니다.
+    """
     try:
-        if chart_type == "bar":
-            fig = create_bar_chart(df, x_column, y_column, title)
-        elif chart_type == "line":
-            fig = create_line_chart(df, x_column, y_column, title)
-        elif chart_type == "scatter":
-            fig = create_scatter_chart(df, x_column, y_column, title)
-        elif chart_type == "pie":
-            fig = create_pie_chart(df, x_column, y_column, title)
-        elif chart_type == "heatmap":
-            fig = create_heatmap(df, chart_info)
-        else:
-            st.warning(f"지원하지 않는 차트 유형입니다: {chart_type}")
-            return None
-        
-        return fig
-    
-    except Exception as e:
-        st.error(f"차트 생성 중 오류 발생: {e}")
+        return create_chart(df, chart_info)
+    except Exception:
         return None
 
 def create_bar_chart(df, x_column, y_column, title=""):
     """
     막대 차트를 생성합니다.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
-    
-    # 열의 데이터 타입에 따라 집계 여부 결정
+    # 열의 데이터 타입에 따라 집계 방식 결정
     if df[x_column].dtype == 'object' or df[x_column].dtype.name == 'category':
-        # 범주형 데이터의 경우 집계
-        agg_data = df.groupby(x_column)[y_column].sum().reset_index()
-        sns.barplot(x=x_column, y=y_column, data=agg_data, ax=ax)
+        # 범주형 데이터의 경우 합계로 집계 (존재하는 범주만, 정렬 없이)
+        agg_data = df.groupby(x_column, observed=True, sort=False, as_index=False)[y_column].sum()
     else:
-        # 수치형 데이터의 경우 직접 플롯
-        sns.barplot(x=x_column, y=y_column, data=df, ax=ax)
+        # 수치형 데이터의 경우 x값별 평균으로 집계
+        agg_data = df.groupby(x_column, observed=True, sort=False, as_index=False)[y_column].mean()
     
-    ax.set_title(title)
-    ax.set_xlabel(x_column)
-    ax.set_ylabel(y_column)
+    fig = px.bar(agg_data, x=x_column, y=y_column, title=title)
     
     # x축 레이블이 길 경우 회전
-    plt.xticks(rotation=45, ha='right')
+    fig.update_xaxes(tickangle=-45)
     
-    plt.tight_layout()
     return fig
 
 def create_line_chart(df, x_column, y_column, title=""):
     """
     선 차트를 생성합니다.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
-    
     # 날짜 열인 경우 정렬
     if pd.api.types.is_datetime64_any_dtype(df[x_column]):
         df = df.sort_values(by=x_column)
@@ -173,97 +211,94 @@ def create_line_chart(df, x_column, y_column, title=""):
     # 열의 데이터 타입에 따라 집계 여부 결정
     if df[x_column].dtype == 'object' or df[x_column].dtype.name == 'category':
         # 범주형 데이터의 경우 집계
-        agg_data = df.groupby(x_column)[y_column].mean().reset_index()
-        ax.plot(agg_data[x_column], agg_data[y_column], marker='o')
+        agg_data = df.groupby(x_column, observed=True, sort=False, as_index=False)[y_column].mean()
+        fig = px.line(agg_data, x=x_column, y=y_column, title=title, markers=True)
     else:
         # 수치형 데이터의 경우 직접 플롯
-        ax.plot(df[x_column], df[y_column], marker='o')
-    
-    ax.set_title(title)
-    ax.set_xlabel(x_column)
-    ax.set_ylabel(y_column)
+        fig = px.line(df, x=x_column, y=y_column, title=title, markers=True)
     
     # x축 레이블이 길 경우 회전
-    plt.xticks(rotation=45, ha='right')
+    fig.update_xaxes(tickangle=-45)
     
-    plt.tight_layout()
     return fig
 
 def create_scatter_chart(df, x_column, y_column, title=""):
     """
     산점도를 생성합니다.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
+    # 점이 너무 많으면 재현 가능한 표본만 표시 (겹쳐 그려지는 점은 정보를 더하지 않음)
+    plot_data = df
+    if len(df) > SCATTER_MAX_POINTS:
+        plot_data = df.sample(SCATTER_MAX_POINTS, random_state=0)
     
-    # 산점도 생성
-    sns.scatterplot(x=x_column, y=y_column, data=df, ax=ax)
+    # 산점도 생성 (WebGL로 브라우저에서 렌더링)
+    fig = px.scatter(plot_data, x=x_column, y=y_column, title=title, render_mode='webgl')
     
     # 추세선 추가
     try:
         # 두 변수가 모두 수치형인 경우에만 추세선 추가
         if pd.api.types.is_numeric_dtype(df[x_column]) and pd.api.types.is_numeric_dtype(df[y_column]):
-            sns.regplot(x=x_column, y=y_column, data=df, scatter=False, ax=ax)
+            data = df[[x_column, y_column]].dropna()
+            x = data[x_column].to_numpy(dtype=float)
+            y = data[y_column].to_numpy(dtype=float)
+            
+            # 1차 회귀 계수를 전체 데이터로 직접 계산하여 양 끝점을 잇는 직선으로 표시
+            slope, intercept = np.polyfit(x, y, 1)
+            x_line = np.array([x.min(), x.max()])
+            fig.add_trace(go.Scatter(x=x_line, y=slope * x_line + intercept, mode='lines', name='추세선'))
     except:
         pass
     
-    ax.set_title(title)
-    ax.set_xlabel(x_column)
-    ax.set_ylabel(y_column)
-    
-    plt.tight_layout()
     return fig
 
 def create_pie_chart(df, x_column, y_column, title=""):
     """
     파이 차트를 생성합니다.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # 범주형 변수에 대한 집계 (존재하는 범주만, 정렬 없이)
+    agg = df.groupby(x_column, observed=True, sort=False)[y_column].sum()
     
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
+    # 조각이 많으면 상위 범주만 표시하고 나머지는 '기타'로 합산
+    if len(agg) > PIE_MAX_SLICES:
+        top = agg.nlargest(PIE_MAX_SLICES)
+        top.index = top.index.astype(object)
+        # 실제 '기타' 범주가 상위에 있으면 덮어쓰지 않고 나머지를 더함
+        top.loc['기타'] = top.get('기타', 0) + (agg.sum() - top.sum())
+        agg = top
     
-    # 범주형 변수에 대한 집계
-    agg_data = df.groupby(x_column)[y_column].sum().reset_index()
+    agg_data = agg.rename_axis(x_column).reset_index(name=y_column)
     
     # 파이 차트 생성
-    ax.pie(agg_data[y_column], labels=agg_data[x_column], autopct='%1.1f%%', startangle=90)
-    ax.axis('equal')  # 원형 파이 차트를 위한 설정
-    
-    ax.set_title(title)
+    fig = px.pie(agg_data, names=x_column, values=y_column, title=title)
+    fig.update_traces(textinfo='percent+label', sort=False)
     
-    plt.tight_layout()
     return fig
 
+@st.cache_data(hash_funcs=_CHART_CACHE_HASH_FUNCS, max_entries=32, show_spinner=False)
 def create_heatmap(df, chart_info):
     """
-    히트맵을 생성합니다.
+    히트맵을 생성합니다. (수치형 열이 2개 미만이면 None 반환)
     """
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
-    
-    # 수치형 열만 선택
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    # 상관관계 계산 (수치형 열만 내부에서 선택)
+    corr_matrix = numeric_corr(df)
     
-    if len(numeric_cols) < 2:
-        st.warning("히트맵을 생성하기 위한 충분한 수치형 열이 없습니다.")
+    if corr_matrix.shape[1] < 2:
         return None
     
-    # 상관관계 계산
-    corr_matrix = df[numeric_cols].corr()
-    
     # 히트맵 생성
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', ax=ax)
-    
     title = chart_info.get("title", "변수 간 상관관계 히트맵")
-    ax.set_title(title)
+    fig = px.imshow(
+        corr_matrix,
+        text_auto='.2f',
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        title=title
+    )
     
-    plt.tight_layout()
     return fig
 
+@st.cache_data(hash_funcs=_CHART_CACHE_HASH_FUNCS, max_entries=32, show_spinner=False)
 def auto_generate_charts(df, max_charts=3):
     """
     데이터프레임을 분석하여 자동으로 의미 있는 차트를 생성합니다.
@@ -273,17 +308,15 @@ def auto_generate_charts(df, max_charts=3):
         max_charts (int): 생성할 최대 차트 수
     
     Returns:
-        list: (차트 제목, matplotlib.figure.Figure) 튜플의 리스트
+        list: (차트 제목, plotly.graph_objects.Figure) 튜플의 리스트
     """
-    # 한글 폰트 재확인
-    set_matplotlib_korean_font()
-    
     charts = []
     
-    # 데이터 타입 파악
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    date_cols = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    # 데이터 타입 파악 (열별 dtype 종류 코드를 한 번만 계산)
+    kinds = df.dtypes.map(lambda dtype: dtype.kind)
+    numeric_cols = kinds[kinds.isin(list('iufc'))].index.tolist()
+    categorical_cols = kinds[kinds == 'O'].index.tolist()  # object, category, 문자열
+    date_cols = kinds[kinds == 'M'].index.tolist()
     
     # 1. 시계열 데이터가 있는 경우 시계열 차트
     if date_cols and numeric_cols:
@@ -296,7 +329,7 @@ def auto_generate_charts(df, max_charts=3):
                 "y_column": num_col,
                 "title": title
             }
-            fig = create_chart(df, chart_info)
+            fig = _create_chart_or_none(df, chart_info)
             if fig:
                 charts.append((title, fig))
                 if len(charts) >= max_charts:
@@ -314,7 +347,7 @@ def auto_generate_charts(df, max_charts=3):
             "y_column": num_col,
             "title": title
         }
-        fig = create_chart(df, chart_info)
+        fig = _create_chart_or_none(df, chart_info)
         if fig:
             charts.append((title, fig))
             if len(charts) >= max_charts:
@@ -332,7 +365,7 @@ def auto_generate_charts(df, max_charts=3):
             "y_column": y_col,
             "title": title
         }
-        fig = create_chart(df, chart_info)
+        fig = _create_chart_or_none(df, chart_info)
         if fig:
             charts.append((title, fig))
             if len(charts) >= max_charts:
@@ -0,0 +1,192 @@
+"""
+데이터 스토리텔러 애플리케이션의 이상치 감지 계산 커널을 제공하는 모듈입니다.
+Numba가 설치되어 있으면 JIT 컴파일된 커널을 사용하고, 없으면 NumPy로 같은 계산을 수행합니다.
+"""
+
+import numpy as np
+
+# Numba가 설치되어 있으면 이상치 감지를 JIT 컴파일된 커널로 수행
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 이상치 목록으로 반환할 최대 행 수
+MAX_LISTED_ANOMALIES = 10
+
+# 이상치 위치를 찾을 때 한 번에 확인할 마스크 구간 크기
+_INDEX_BLOCK_SIZE = 65536
+
+def _quartiles(valid):
+    """
+    부분 정렬(np.partition) 한 번으로 1사분위수와 3사분위수를 계산합니다.
+    전체 정렬 없이 필요한 순위의 값만 찾으며, 보간 방식은 pandas/NumPy 기본값(linear)과 같습니다.
+    
+    Args:
+        valid (numpy.ndarray): 결측치가 없는 float64 1차원 배열
+    
+    Returns:
+        tuple: (1사분위수, 3사분위수)
+    """
+    n = valid.size
+    pos1 = 0.25 * (n - 1)
+    pos3 = 0.75 * (n - 1)
+    lo1 = int(pos1)
+    lo3 = int(pos3)
+    hi1 = min(lo1 + 1, n - 1)
+    hi3 = min(lo3 + 1, n - 1)
+    
+    part = np.partition(valid, np.array([lo1, hi1, lo3, hi3]))
+    q1 = part[lo1] + (pos1 - lo1) * (part[hi1] - part[lo1])
+    q3 = part[lo3] + (pos3 - lo3) * (part[hi3] - part[lo3])
+    return q1, q3
+
+if NUMBA_AVAILABLE:
+    _quartiles_kernel = njit(cache=True)(_quartiles)
+    
+    @njit(cache=True)
+    def _iqr_kernel(arr, threshold, max_keep):
+        """
+        IQR 기준 경계값을 계산하고, 경계를 벗어난 값의 개수와 앞쪽 위치를 한 번의 순회로 찾습니다.
+        
+        Args:
+            arr (numpy.ndarray): float64 1차원 배열 (결측치는 NaN)
+            threshold (float): IQR 배수
+            max_keep (int): 위치를 기록할 최대 이상치 수
+        
+        Returns:
+            tuple: (하한, 상한, 이상치 개수, 이상치 위치 배열)
+        """
+        valid = arr[~np.isnan(arr)]
+        if valid.size == 0:
+            return np.nan, np.nan, 0, np.empty(0, np.int64)
+        
+        q1, q3 = _quartiles_kernel(valid)
+        iqr = q3 - q1
+        lower_bound = q1 - threshold * iqr
+        upper_bound = q3 + threshold * iqr
+        
+        indices = np.empty(max_keep, np.int64)
+        count = 0
+        for i in range(arr.size):
+            if arr[i] < lower_bound or arr[i] > upper_bound:
+                if count < max_keep:
+                    indices[count] = i
+                count += 1
+        
+        return lower_bound, upper_bound, count, indices[:min(count, max_keep)]
+    
+    @njit(cache=True)
+    def _zscore_kernel(arr, threshold, max_keep):
+        """
+        Welford 방식으로 평균과 표준편차를 한 번에 계산한 뒤, Z-점수가 임계값을 넘는 값을 찾습니다.
+        
+        Args:
+            arr (numpy.ndarray): float64 1차원 배열 (결측치는 NaN)
+            threshold (float): Z-점수 임계값
+            max_keep (int): 위치를 기록할 최대 이상치 수
+        
+        Returns:
+            tuple: (평균, 표준편차, 이상치 개수, 이상치 위치 배열)
+        """
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(arr.size):
+            x = arr[i]
+            if np.isnan(x):
+                continue
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        
+        if n == 0:
+            return np.nan, np.nan, 0, np.empty(0, np.int64)
+        std = (m2 / n) ** 0.5
+        
+        indices = np.empty(max_keep, np.int64)
+        count = 0
+        for i in range(arr.size):
+            # NaN과의 비교는 항상 거짓이므로 결측치는 자동으로 제외됨
+            if abs(arr[i] - mean) > threshold * std:
+                if count < max_keep:
+                    indices[count] = i
+                count += 1
+        
+        return mean, std, count, indices[:min(count, max_keep)]
+
+def _first_indices(mask, max_keep):
+    """
+    불리언 마스크에서 참인 위치의 개수와 앞쪽 위치를 반환합니다.
+    이상치가 많으면 전체 위치 배열을 만들지 않고, 앞쪽 구간부터 필요한 개수만큼만 찾습니다.
+    """
+    count = int(np.count_nonzero(mask))
+    if count <= max_keep:
+        return count, np.flatnonzero(mask)
+    
+    found = []
+    kept = 0
+    for start in range(0, mask.size, _INDEX_BLOCK_SIZE):
+        block = np.flatnonzero(mask[start:start + _INDEX_BLOCK_SIZE])[:max_keep - kept] + start
+        found.append(block)
+        kept += block.size
+        if kept >= max_keep:
+            break
+    
+    return count, np.concatenate(found)
+
+def find_iqr_outliers(arr, threshold=1.5, max_keep=MAX_LISTED_ANOMALIES):
+    """
+    IQR 방법으로 이상치를 찾습니다.
+    
+    Args:
+        arr (numpy.ndarray): float64 1차원 배열 (결측치는 NaN)
+        threshold (float): IQR 배수
+        max_keep (int): 위치를 기록할 최대 이상치 수
+    
+    Returns:
+        tuple: (하한, 상한, 이상치 개수, 이상치 위치 배열)
+    """
+    if NUMBA_AVAILABLE:
+        return _iqr_kernel(arr, threshold, max_keep)
+    
+    valid = arr[~np.isnan(arr)]
+    if valid.size == 0:
+        return np.nan, np.nan, 0, np.empty(0, np.int64)
+    
+    q1, q3 = _quartiles(valid)
+    iqr = q3 - q1
+    lower_bound = q1 - threshold * iqr
+    upper_bound = q3 + threshold * iqr
+    
+    count, indices = _first_indices((arr < lower_bound) | (arr > upper_bound), max_keep)
+    return lower_bound, upper_bound, count, indices
+
+def find_zscore_outliers(arr, threshold=3.0, max_keep=MAX_LISTED_ANOMALIES):
+    """
+    Z-점수 방법으로 이상치를 찾습니다. (모표준편차 기준)
+    
+    Args:
+        arr (numpy.ndarray): float64 1차원 배열 (결측치는 NaN)
+        threshold (float): Z-점수 임계값
+        max_keep (int): 위치를 기록할 최대 이상치 수
+    
+    Returns:
+        tuple: (평균, 표준편차, 이상치 개수, 이상치 위치 배열)
+    """
+    if NUMBA_AVAILABLE:
+        return _zscore_kernel(arr, threshold, max_keep)
+    
+    if np.isnan(arr).all():
+        return np.nan, np.nan, 0, np.empty(0, np.int64)
+    
+    mean = np.nanmean(arr)
+    std = np.nanstd(arr)
+    
+    # 편차 배열 하나만 만들고 절댓값은 제자리에서 계산 (중간 배열 최소화)
+    deviation = arr - mean
+    np.abs(deviation, out=deviation)
+    count, indices = _first_indices(deviation > threshold * std, max_keep)
+    return mean, std, count, indices
@@ -4,21 +4,16 @@
 
 import json
 
-def generate_data_story_prompt(dataframe_info, audience, focus, length, sample_data):
+def _build_simplified_info_str(dataframe_info):
     """
-    데이터 스토리 생성을 위한 프롬프트를 생성합니다.
+    프롬프트에 포함할 데이터프레임 분석 결과 요약을 JSON 문자열로 만듭니다.
     
     Args:
         dataframe_info (dict): 데이터프레임 분석 결과
-        audience (str): 타겟 청중 (경영진, 마케팅팀, 기술팀, 일반 대중)
-        focus (str): 분석 중점 (주요 트렌드, 이상치, 상관관계, 종합 인사이트)
-        length (str): 스토리 길이 (간결, 보통, 상세)
-        sample_data (dict): 샘플 데이터 (최대 10행)
     
     Returns:
-        str: GPT API에 전달할 프롬프트
+        str: 요약된 분석 결과 JSON 문자열
     """
-    
     # 데이터 정보를 JSON 문자열로 변환
     # 너무 큰 JSON은 잘라내기
     # basic_info와 중요 통계만 포함
@@ -57,31 +52,42 @@ def generate_data_story_prompt(dataframe_info, audience, focus, length, sample_d
         # 상관계수 0.5 이상인 경우만 포함
         high_correlations = []
         corr_data = dataframe_info["correlation"]
-        if isinstance(corr_data, dict):
-            for col1, corr_vals in corr_data.items():
-                if isinstance(corr_vals, dict):
-                    for col2, val in corr_vals.items():
-                        if col1 != col2 and abs(val) >= 0.5:
-                            high_correlations.append({
-                                "column1": col1,
-                                "column2": col2,
-                                "correlation": val
-                            })
+        if isinstance(corr_data, list):
+            # {a, b, r} 목록 형식 (위쪽 삼각형만 포함되어 중복 없음)
+            for item in corr_data:
+                if isinstance(item, dict) and abs(item.get("r", 0)) >= 0.5:
+                    high_correlations.append({
+                        "column1": item.get("a"),
+                        "column2": item.get("b"),
+                        "correlation": item.get("r")
+                    })
         
         if high_correlations:
             simplified_info["high_correlations"] = high_correlations
     
-    # JSON 문자열로 변환
-    dataframe_info_str = json.dumps(simplified_info, ensure_ascii=False, indent=2)
+    # JSON 문자열로 변환 (들여쓰기 없이 압축하여 토큰 수 절약)
+    return json.dumps(simplified_info, ensure_ascii=False, separators=(',', ':'))
+
+def generate_data_story_prompt(dataframe_info, audience, focus, length, sample_data):
+    """
+    데이터 스토리 생성을 위한 프롬프트를 생성합니다.
+    
+    Args:
+        dataframe_info (dict): 데이터프레임 분석 결과 (correlation은 {a, b, r} 목록)
+        audience (str): 타겟 청중 (경영진, 마케팅팀, 기술팀, 일반 대중)
+        focus (str): 분석 중점 (주요 트렌드, 이상치, 상관관계, 종합 인사이트)
+        length (str): 스토리 길이 (간결, 보통, 상세)
+        sample_data (str): CSV 형식의 샘플 데이터 (최대 10행)
     
-    # 샘플 데이터 간소화 (최대 5행)
-    sample_data_simplified = {}
-    if isinstance(sample_data, dict):
-        for col, values in sample_data.items():
-            if isinstance(values, dict):
-                sample_data_simplified[col] = dict(list(values.items())[:5])
+    Returns:
+        str: GPT API에 전달할 프롬프트
+    """
+
+    # 데이터 정보 요약을 JSON 문자열로 변환
+    dataframe_info_str = _build_simplified_info_str(dataframe_info)
     
-    sample_data_str = json.dumps(sample_data_simplified, ensure_ascii=False, indent=2)
+    # 샘플 데이터 (CSV 문자열 - 행마다 열 이름을 반복하지 않아 토큰 수가 적음)
+    sample_data_str = sample_data.strip() if isinstance(sample_data, str) else ""
     
     # 청중별 특성 정의
     audience_characteristics = {
@@ -124,8 +130,8 @@ def generate_data_story_prompt(dataframe_info, audience, focus, length, sample_d
 {dataframe_info_str}
 ```
 
-## 샘플 데이터 (일부):
-```json
+## 샘플 데이터 (CSV):
+```csv
 {sample_data_str}
 ```
 
@@ -177,8 +183,8 @@ def generate_insights_prompt(dataframe_info, specific_question):
         str: GPT API에 전달할 프롬프트
     """
     
-    # 데이터 정보를 JSON 문자열로 변환
-    dataframe_info_str = json.dumps(dataframe_info, ensure_ascii=False, indent=2)
+    # 데이터 정보를 JSON 문자열로 변환 (들여쓰기 없이 압축하여 토큰 수 절약)
+    dataframe_info_str = json.dumps(dataframe_info, ensure_ascii=False, separators=(',', ':'))
     
     # 프롬프트 템플릿
     prompt = f"""
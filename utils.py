@@ -6,6 +6,59 @@ import pandas as pd
 import numpy as np
 import json
 import re
+from detect_anomalies_numba import find_iqr_outliers, find_zscore_outliers, MAX_LISTED_ANOMALIES
+
+# Numba가 설치되어 있으면 추세 회귀 계산을 JIT 컴파일된 커널로 수행
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _linregress_kernel(x, y):
+        """
+        단순 선형 회귀를 한 번의 순회(Welford 방식)로 계산합니다.
+        
+        Args:
+            x (numpy.ndarray): float64 1차원 배열 (독립 변수)
+            y (numpy.ndarray): float64 1차원 배열 (종속 변수)
+        
+        Returns:
+            tuple: (기울기, 절편, 상관계수, t 통계량, 자유도)
+        """
+        n = x.size
+        x_mean = 0.0
+        y_mean = 0.0
+        ssxm = 0.0
+        ssym = 0.0
+        ssxym = 0.0
+        for i in range(n):
+            dx = x[i] - x_mean
+            dy = y[i] - y_mean
+            x_mean += dx / (i + 1)
+            y_mean += dy / (i + 1)
+            ssxm += dx * (x[i] - x_mean)
+            ssym += dy * (y[i] - y_mean)
+            ssxym += dx * (y[i] - y_mean)
+        
+        if ssxm == 0.0:
+            raise ValueError("모든 x 값이 같으면 선형 회귀를 계산할 수 없습니다.")
+        
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x_mean
+        
+        # scipy.stats.linregress와 같은 방식으로 상관계수와 t 통계량 계산
+        if ssym == 0.0:
+            r = 0.0
+        else:
+            r = min(max(ssxym / np.sqrt(ssxm * ssym), -1.0), 1.0)
+        dof = n - 2
+        tiny = 1.0e-20
+        t_stat = r * np.sqrt(dof / ((1.0 - r + tiny) * (1.0 + r + tiny)))
+        
+        return slope, intercept, r, t_stat, dof
 
 def format_number(value, precision=2):
     """
@@ -18,10 +71,11 @@ def format_number(value, precision=2):
     Returns:
         str: 포맷팅된 숫자 문자열
     """
-    if pd.isna(value):
-        return "N/A"
-    
     if isinstance(value, (int, float)):
+        # NaN은 자기 자신과 같지 않으므로 pd.isna를 거치지 않고 바로 확인
+        if value != value:
+            return "N/A"
+        
         # 1000 단위 구분자 추가
         if abs(value) >= 1000000:
             return f"{value / 1000000:.{precision}f}M"
@@ -32,8 +86,83 @@ def format_number(value, precision=2):
         else:
             return f"{value:,.{precision}f}"
     
+    # 그 밖의 결측값 (None, pd.NA, pd.NaT 등)
+    if pd.isna(value):
+        return "N/A"
+    
     return str(value)
 
+def hash_dataframe(df):
+    """
+    캐시 키로 사용할 데이터프레임의 지문(fingerprint)을 계산합니다.
+    
+    Args:
+        df (pandas.DataFrame): 데이터프레임
+    
+    Returns:
+        tuple: (열 이름, 크기, 행 해시 합계)
+    """
+    return (tuple(df.columns), df.shape, int(pd.util.hash_pandas_object(df, index=True).sum()))
+
+def hash_dict(d):
+    """
+    캐시 키로 사용할 딕셔너리의 지문을 계산합니다. (키 순서와 무관)
+    
+    Args:
+        d (dict): 딕셔너리
+    
+    Returns:
+        str: 키를 정렬한 JSON 문자열
+    """
+    return json.dumps(d, sort_keys=True, ensure_ascii=False, default=str)
+
+def numeric_corr(df):
+    """
+    수치형 열 간의 상관관계 행렬을 계산합니다. (bool 열 제외, select_dtypes('number')와 같은 열 기준)
+    
+    Args:
+        df (pandas.DataFrame): 데이터프레임
+    
+    Returns:
+        pandas.DataFrame: 상관관계 행렬
+    """
+    # dtype 종류(정수/부호 없는 정수/실수/복소수)만 보고 한 번에 선택 (bool 열은 제외)
+    is_numeric = [dtype.kind in 'iufc' for dtype in df.dtypes]
+    return df.loc[:, is_numeric].corr()
+
+# 일반적인 열 이름에 대한 설명
+COLUMN_DESCRIPTIONS = {
+    "date": "날짜",
+    "region": "지역",
+    "product_category": "제품 카테고리",
+    "sales_amount": "판매액",
+    "units_sold": "판매량",
+    "customer_type": "고객 유형",
+    "promotion_active": "프로모션 활성 여부",
+    "campaign_id": "캠페인 ID",
+    "channel": "마케팅 채널",
+    "cost": "비용",
+    "impressions": "노출 수",
+    "clicks": "클릭 수",
+    "conversions": "전환 수",
+    "conversion_value": "전환 가치",
+    "target_audience": "타겟 고객층",
+    "survey_id": "설문 ID",
+    "customer_id": "고객 ID",
+    "age_group": "연령대",
+    "gender": "성별",
+    "purchase_frequency": "구매 빈도",
+    "product_quality_rating": "제품 품질 평가",
+    "customer_service_rating": "고객 서비스 평가",
+    "price_satisfaction": "가격 만족도",
+    "recommendation_likelihood": "추천 가능성",
+    "overall_satisfaction": "전반적인 만족도",
+    "feedback_text": "피드백 텍스트"
+}
+
+# 대소문자 구분 없이 조회하기 위한 소문자 키 사전 (모듈 로드 시 한 번만 생성)
+_COLUMN_DESCRIPTIONS_LOWER = {key.lower(): value for key, value in COLUMN_DESCRIPTIONS.items()}
+
 def get_column_description(column_name):
     """
     일반적인 열 이름에 대한 설명을 제공합니다.
@@ -44,42 +173,18 @@ def get_column_description(column_name):
     Returns:
         str: 열에 대한 설명
     """
-    column_descriptions = {
-        "date": "날짜",
-        "region": "지역",
-        "product_category": "제품 카테고리",
-        "sales_amount": "판매액",
-        "units_sold": "판매량",
-        "customer_type": "고객 유형",
-        "promotion_active": "프로모션 활성 여부",
-        "campaign_id": "캠페인 ID",
-        "channel": "마케팅 채널",
-        "cost": "비용",
-        "impressions": "노출 수",
-        "clicks": "클릭 수",
-        "conversions": "전환 수",
-        "conversion_value": "전환 가치",
-        "target_audience": "타겟 고객층",
-        "survey_id": "설문 ID",
-        "customer_id": "고객 ID",
-        "age_group": "연령대",
-        "gender": "성별",
-        "purchase_frequency": "구매 빈도",
-        "product_quality_rating": "제품 품질 평가",
-        "customer_service_rating": "고객 서비스 평가",
-        "price_satisfaction": "가격 만족도",
-        "recommendation_likelihood": "추천 가능성",
-        "overall_satisfaction": "전반적인 만족도",
-        "feedback_text": "피드백 텍스트"
-    }
-    
     # 정확한 일치 확인
-    if column_name in column_descriptions:
-        return column_descriptions[column_name]
+    if column_name in COLUMN_DESCRIPTIONS:
+        return COLUMN_DESCRIPTIONS[column_name]
+    
+    # 대소문자 무시 일치 확인 (소문자 변환은 한 번만 수행)
+    lowered = column_name.lower()
+    if lowered in _COLUMN_DESCRIPTIONS_LOWER:
+        return _COLUMN_DESCRIPTIONS_LOWER[lowered]
     
     # 부분 일치 확인
-    for key, value in column_descriptions.items():
-        if key in column_name.lower():
+    for key, value in _COLUMN_DESCRIPTIONS_LOWER.items():
+        if key in lowered:
             return value
     
     # 일치하는 설명이 없는 경우
@@ -102,16 +207,13 @@ def extract_key_metrics(df, column_map=None):
     metrics = {}
     
     # 일반적인 지표 추출
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-    
-    for col in numeric_cols:
-        metrics[col] = {
-            "mean": float(df[col].mean()),
-            "median": float(df[col].median()),
-            "min": float(df[col].min()),
-            "max": float(df[col].max()),
-            "sum": float(df[col].sum())
-        }
+    numeric_cols = df.select_dtypes(include='number').columns
+    
+    # 모든 수치형 열의 통계량을 한 번의 집계로 계산
+    if len(numeric_cols) > 0:
+        stats_df = df[numeric_cols].agg(['mean', 'median', 'min', 'max', 'sum']).astype(float)
+        for col in numeric_cols:
+            metrics[col] = stats_df[col].to_dict()
     
     # 특정 열에 대한 지표 추출
     # 판매액
@@ -154,26 +256,20 @@ def identify_correlations(df, threshold=0.5):
     Returns:
         list: (변수1, 변수2, 상관계수) 튜플의 리스트
     """
-    # 수치형 열만 선택
-    numeric_df = df.select_dtypes(include=['int64', 'float64'])
+    # 상관관계 계산 (수치형 열만 내부에서 선택)
+    corr_matrix = numeric_corr(df)
     
-    if numeric_df.shape[1] < 2:
+    if corr_matrix.shape[1] < 2:
         return []
     
-    # 상관관계 계산
-    corr_matrix = numeric_df.corr()
-    
-    # 상관계수가 임계값을 초과하는 변수 쌍 찾기
-    strong_correlations = []
+    # 상관계수가 임계값을 초과하는 변수 쌍 찾기 (상삼각 행렬만 확인하여 중복 방지)
+    values = corr_matrix.to_numpy()
+    rows, cols = np.triu_indices(values.shape[0], k=1)
+    pair_values = values[rows, cols]
+    mask = np.abs(pair_values) >= threshold
     
-    for i in range(corr_matrix.shape[0]):
-        for j in range(i+1, corr_matrix.shape[0]):  # 대각선 아래쪽만 확인 (중복 방지)
-            if abs(corr_matrix.iloc[i, j]) >= threshold:
-                strong_correlations.append((
-                    corr_matrix.index[i],
-                    corr_matrix.columns[j],
-                    corr_matrix.iloc[i, j]
-                ))
+    names = corr_matrix.columns.to_numpy()
+    strong_correlations = list(zip(names[rows[mask]], names[cols[mask]], pair_values[mask]))
     
     # 상관계수의 절대값 기준으로 내림차순 정렬
     strong_correlations.sort(key=lambda x: abs(x[2]), reverse=True)
@@ -213,14 +309,21 @@ def identify_trends(df, date_column, value_column):
     try:
         import scipy.stats as stats
         
-        # 날짜를 숫자로 변환 (선형 회귀를 위해)
-        df_sorted['date_numeric'] = (df_sorted[date_column] - df_sorted[date_column].min()).dt.days
+        # 날짜를 첫 날짜로부터의 경과 일수로 변환 (선형 회귀를 위해, 정수 나노초 연산으로 처리)
+        # 정렬 후에는 첫 값이 최솟값이며, 결측 날짜(NaT)는 뒤쪽에 위치하고 NaN으로 처리
+        ns = df_sorted[date_column].to_numpy(dtype='datetime64[ns]').view('i8')
+        nat = ns == np.iinfo(np.int64).min
+        x = ((ns - ns[0]) // (86_400 * 10**9)).astype(np.float64)
+        x[nat] = np.nan
         
         # 선형 회귀 계산
-        slope, intercept, r_value, p_value, std_err = stats.linregress(
-            df_sorted['date_numeric'],
-            df_sorted[value_column]
-        )
+        y = df_sorted[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        if NUMBA_AVAILABLE:
+            slope, intercept, r_value, t_stat, dof = _linregress_kernel(x, y)
+            # p-value는 t 분포의 양측 검정으로 한 번만 계산
+            p_value = 2 * stats.t.sf(abs(t_stat), dof)
+        else:
+            slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
         
         # 추세 해석
         if p_value < 0.05:  # 통계적으로 유의미한 추세
@@ -255,8 +358,7 @@ def identify_trends(df, date_column, value_column):
     except:
         # scipy가 없거나 오류 발생시
         # 간단한 추세 계산 (첫 값과 마지막 값 비교)
-        first_value = df_sorted[value_column].iloc[0]
-        last_value = df_sorted[value_column].iloc[-1]
+        first_value, last_value = df_sorted[value_column].iloc[[0, -1]].to_numpy()
         
         if last_value > first_value:
             trend_direction = "상승"
@@ -326,39 +428,35 @@ def detect_anomalies(df, column, method='iqr', threshold=1.5):
         "anomalies": []
     }
     
+    # 결측치는 NaN으로 변환하여 커널에서 건너뜀
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    
     if method == 'iqr':
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
-        IQR = Q3 - Q1
-        
-        lower_bound = Q1 - threshold * IQR
-        upper_bound = Q3 + threshold * IQR
-        
-        anomalies = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
+        lower_bound, upper_bound, count, indices = find_iqr_outliers(
+            values, threshold, MAX_LISTED_ANOMALIES
+        )
         
         result.update({
             "lower_bound": float(lower_bound),
             "upper_bound": float(upper_bound),
-            "anomaly_count": len(anomalies),
-            "anomaly_percent": (len(anomalies) / len(df)) * 100,
-            "anomalies": anomalies.to_dict(orient='records') if len(anomalies) <= 10 else None
+            "anomaly_count": int(count),
+            "anomaly_percent": (count / len(df)) * 100,
+            "anomalies": df.iloc[indices].to_dict(orient='records') if count <= MAX_LISTED_ANOMALIES else None
         })
         
-        if result["anomaly_count"] > 10:
+        if result["anomaly_count"] > MAX_LISTED_ANOMALIES:
             result["note"] = "10개 이상의 이상치가 발견되어 전체 목록은 생략됩니다."
     
     elif method == 'zscore':
-        from scipy import stats
-        z_scores = np.abs(stats.zscore(df[column]))
-        anomalies = df[z_scores > threshold]
+        _, _, count, indices = find_zscore_outliers(values, threshold, MAX_LISTED_ANOMALIES)
         
         result.update({
-            "anomaly_count": len(anomalies),
-            "anomaly_percent": (len(anomalies) / len(df)) * 100,
-            "anomalies": anomalies.to_dict(orient='records') if len(anomalies) <= 10 else None
+            "anomaly_count": int(count),
+            "anomaly_percent": (count / len(df)) * 100,
+            "anomalies": df.iloc[indices].to_dict(orient='records') if count <= MAX_LISTED_ANOMALIES else None
         })
         
-        if result["anomaly_count"] > 10:
+        if result["anomaly_count"] > MAX_LISTED_ANOMALIES:
             result["note"] = "10개 이상의 이상치가 발견되어 전체 목록은 생략됩니다."
     
     return result